@@ -4,13 +4,19 @@ Wolfstitch Cloud - Downloads API
 Serves generated export files for download
 """
 
+import asyncio
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import logging
 
+from email.utils import formatdate
+from urllib.parse import quote
+
 from fastapi import APIRouter, HTTPException, Header
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from backend.services.storage_service import StorageService
 from backend.dependencies import get_current_user, get_rate_limiter
 
@@ -18,15 +24,90 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Streaming read size, tunable per deployment via environment variable.
+# 8 MiB default keeps syscall/await counts low on large exports; small VMs
+# can dial it back down to 1 MiB.
+CHUNK_SIZE = int(os.getenv("WOLFSTITCH_DOWNLOAD_CHUNK", 8 * 1024 * 1024))
+
+# Headers that never vary per request, merged into each response
+_STATIC_DL_HEADERS = {
+    "Accept-Ranges": "bytes",
+    "Cache-Control": "private, max-age=3600"
+}
+
+
+@lru_cache(maxsize=1024)
+def _content_disposition(filename: str) -> str:
+    """Build the Content-Disposition value, RFC 5987-encoding non-ASCII names"""
+    if filename.isascii():
+        return f'attachment; filename="{filename}"'
+    fallback = filename.encode("ascii", "replace").decode("ascii")
+    encoded = quote(filename)
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{encoded}'
+
+# Optional io_uring/libaio-backed reads on Linux - unlike a threadpool,
+# these submit real async disk I/O to the kernel
+try:
+    from caio import AsyncioContext
+except ImportError:
+    AsyncioContext = None
+
+_caio_ctx = None
+
+
+def _get_caio_context():
+    """Return the shared caio context, or None when caio is unavailable"""
+    global _caio_ctx
+    if _caio_ctx is None and AsyncioContext is not None:
+        _caio_ctx = AsyncioContext(max_requests=128)
+    return _caio_ctx
+
+
 # Initialize storage service
 storage_service = StorageService()
 
+# Short TTL cache over access validation + path resolution. Download
+# managers issue dozens of range requests per file; storage ids are
+# one-shot and immutable, so 60s of staleness is safe.
+_ACCESS_CACHE_TTL = 60.0
+_access_cache: dict = {}
+_access_cache_lock = asyncio.Lock()
+
+
+async def _resolve_access(storage_id: str, user_id: Optional[str]):
+    """
+    Validate access and resolve the file path, cached per (storage_id, user_id)
+
+    Returns:
+        Tuple of (access_allowed, file_path)
+    """
+    key = (storage_id, user_id)
+    now = time.monotonic()
+
+    async with _access_cache_lock:
+        hit = _access_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+
+    allowed = await storage_service.validate_access(storage_id, user_id)
+    file_path = await storage_service.get_file_path(storage_id) if allowed else None
+
+    async with _access_cache_lock:
+        _access_cache[key] = (now + _ACCESS_CACHE_TTL, (allowed, file_path))
+        # Opportunistic purge keeps the cache bounded
+        if len(_access_cache) > 1024:
+            for stale_key in [k for k, v in _access_cache.items() if v[0] <= now]:
+                del _access_cache[stale_key]
+
+    return allowed, file_path
+
 
 @router.get("/{storage_id}/{filename}")
 async def download_file(
     storage_id: str,
     filename: str,
     user_id: Optional[str] = Header(None, alias="X-User-ID"),
+    if_none_match: Optional[str] = Header(None),
     rate_limiter=None  # Optional rate limiter dependency
 ):
     """
@@ -38,38 +119,51 @@ async def download_file(
         user_id: Optional user ID for access control
     """
     try:
-        # Validate access
-        if not await storage_service.validate_access(storage_id, user_id):
+        # Validate access and resolve path through the TTL cache
+        allowed, file_path = await _resolve_access(storage_id, user_id)
+        if not allowed:
             logger.warning(f"Access denied for storage_id: {storage_id}, user: {user_id}")
             raise HTTPException(
                 status_code=403,
                 detail="Access denied or file expired"
             )
-        
-        # Get file path
-        file_path = await storage_service.get_file_path(storage_id)
-        if not file_path or not file_path.exists():
+
+        # A single stat off the loop both confirms existence and avoids
+        # blocking the event loop on slow filesystems
+        st = None
+        if file_path:
+            try:
+                st = await asyncio.to_thread(os.stat, file_path)
+            except FileNotFoundError:
+                file_path = None
+        if not file_path:
             logger.error(f"File not found for storage_id: {storage_id}")
             raise HTTPException(
                 status_code=404,
                 detail="File not found or has been removed"
             )
-        
+
+        # Exports are immutable, so a weak ETag from size+mtime lets repeat
+        # downloads short-circuit to a bodyless 304
+        etag = _make_etag(storage_id, st)
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
         # Determine content type based on file extension
         content_type = _get_content_type(filename)
-        
+
         logger.info(f"Serving download: {filename} (storage_id: {storage_id})")
-        
+
         # Return file response with proper headers
         return FileResponse(
             path=str(file_path),
             filename=filename,
             media_type=content_type,
             headers={
-                "Content-Disposition": f'attachment; filename="{filename}"',
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
+                **_STATIC_DL_HEADERS,
+                "Content-Disposition": _content_disposition(filename),
+                "ETag": etag,
+                "Last-Modified": formatdate(st.st_mtime, usegmt=True)
             }
         )
         
@@ -88,7 +182,9 @@ async def stream_download(
     storage_id: str,
     filename: str,
     user_id: Optional[str] = Header(None, alias="X-User-ID"),
-    range: Optional[str] = Header(None)
+    range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None)
 ):
     """
     Stream download with support for partial content (resume)
@@ -100,40 +196,55 @@ async def stream_download(
         range: HTTP Range header for partial downloads
     """
     try:
-        # Validate access
-        if not await storage_service.validate_access(storage_id, user_id):
+        # Validate access and resolve path through the TTL cache
+        allowed, file_path = await _resolve_access(storage_id, user_id)
+        if not allowed:
             raise HTTPException(
                 status_code=403,
                 detail="Access denied or file expired"
             )
-        
-        # Get file path
-        file_path = await storage_service.get_file_path(storage_id)
-        if not file_path or not file_path.exists():
+
+        # One stat call gives both existence and size, off the event loop
+        if not file_path:
             raise HTTPException(
                 status_code=404,
                 detail="File not found"
             )
-        
-        file_size = file_path.stat().st_size
-        
+        try:
+            st = await asyncio.to_thread(os.stat, file_path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=404,
+                detail="File not found"
+            )
+
+        file_size = st.st_size
+
+        etag = _make_etag(storage_id, st)
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Per RFC 7233, an If-Range that no longer matches means the client's
+        # partial copy is stale - ignore the Range and serve the full body
+        if if_range is not None and if_range != etag:
+            range = None
+
         # Handle range requests for resume support
         if range:
             return await _handle_range_request(file_path, filename, file_size, range)
-        
-        # Stream entire file
-        async def iterfile():
-            async with aiofiles.open(file_path, 'rb') as f:
-                while chunk := await f.read(1024 * 1024):  # 1MB chunks
-                    yield chunk
-        
-        return StreamingResponse(
-            iterfile(),
+
+        # Full-file transfers go through FileResponse, which uses the kernel
+        # sendfile() path where available instead of copying every chunk
+        # through Python userspace buffers
+        return FileResponse(
+            path=str(file_path),
+            filename=filename,
             media_type=_get_content_type(filename),
             headers={
-                "Content-Disposition": f'attachment; filename="{filename}"',
-                "Content-Length": str(file_size),
-                "Accept-Ranges": "bytes"
+                **_STATIC_DL_HEADERS,
+                "Content-Disposition": _content_disposition(filename),
+                "ETag": etag,
+                "Last-Modified": formatdate(st.st_mtime, usegmt=True)
             }
         )
         
@@ -147,51 +258,120 @@ async def stream_download(
         )
 
 
+def _make_etag(storage_id: str, st: os.stat_result) -> str:
+    """Build a weak ETag for an immutable stored export"""
+    return f'W/"{storage_id}-{st.st_size}-{int(st.st_mtime)}"'
+
+
+def _parse_range(range_header: str, file_size: int) -> list:
+    """
+    Parse an RFC 7233 Range header into a list of (start, end) byte tuples
+
+    Handles normal ranges (bytes=0-1023), open-ended ranges (bytes=500-),
+    suffix ranges (bytes=-500 meaning the last 500 bytes), and
+    comma-separated multi-range requests. Ends are clamped to the file size.
+
+    Raises:
+        ValueError: If the header is malformed or no range is satisfiable
+    """
+    unit, sep, spec = range_header.partition("=")
+    if not sep or unit.strip() != "bytes":
+        raise ValueError(f"Unsupported range unit: {range_header}")
+
+    ranges = []
+    for part in spec.split(","):
+        start_s, dash, end_s = part.strip().partition("-")
+        if not dash:
+            raise ValueError(f"Malformed range spec: {part}")
+
+        if not start_s:
+            # Suffix range: last N bytes of the file
+            suffix_length = int(end_s)
+            if suffix_length <= 0:
+                continue
+            start = max(file_size - suffix_length, 0)
+            end = file_size - 1
+        else:
+            start = int(start_s)
+            end = min(int(end_s), file_size - 1) if end_s else file_size - 1
+
+        if start >= file_size or start > end:
+            continue
+        ranges.append((start, end))
+
+    if not ranges:
+        raise ValueError("No satisfiable ranges")
+    return ranges
+
+
 async def _handle_range_request(file_path: Path, filename: str, file_size: int, range_header: str):
     """Handle HTTP range requests for partial downloads"""
     try:
-        import aiofiles
-        
-        # Parse range header (e.g., "bytes=0-1023")
-        range_spec = range_header.replace("bytes=", "")
-        ranges = range_spec.split("-")
-        
-        start = int(ranges[0]) if ranges[0] else 0
-        end = int(ranges[1]) if ranges[1] else file_size - 1
-        
-        # Validate range
-        if start >= file_size or end >= file_size:
+        try:
+            ranges = _parse_range(range_header, file_size)
+        except ValueError:
             raise HTTPException(
                 status_code=416,
                 detail="Requested range not satisfiable"
             )
-        
-        # Calculate content length
+
+        # Multi-range requests get a multipart/byteranges response
+        if len(ranges) > 1:
+            return _multipart_range_response(file_path, filename, file_size, ranges)
+
+        start, end = ranges[0]
         content_length = end - start + 1
-        
-        # Stream partial content
+
+        # Stream partial content. Prefer caio's kernel-submitted async reads
+        # where available; otherwise plain sync reads dispatched off the
+        # loop - a thread handoff per CHUNK_SIZE read is cheaper than
+        # aiofiles' per-call threadpool wrapping of every file operation.
         async def iterfile_range():
-            async with aiofiles.open(file_path, 'rb') as f:
-                await f.seek(start)
+            ctx = _get_caio_context()
+            if ctx is not None:
+                fd = await asyncio.to_thread(os.open, str(file_path), os.O_RDONLY)
+                try:
+                    offset = start
+                    remaining = content_length
+                    while remaining > 0:
+                        chunk = await ctx.read(min(CHUNK_SIZE, remaining), fd, offset)
+                        if not chunk:
+                            break
+                        offset += len(chunk)
+                        remaining -= len(chunk)
+                        yield chunk
+                finally:
+                    os.close(fd)
+                return
+
+            def _open():
+                f = open(file_path, 'rb')
+                f.seek(start)
+                return f
+
+            f = await asyncio.to_thread(_open)
+            try:
                 remaining = content_length
-                
+
                 while remaining > 0:
-                    chunk_size = min(1024 * 1024, remaining)  # 1MB chunks
-                    chunk = await f.read(chunk_size)
+                    chunk_size = min(CHUNK_SIZE, remaining)
+                    chunk = await asyncio.to_thread(f.read, chunk_size)
                     if not chunk:
                         break
                     remaining -= len(chunk)
                     yield chunk
+            finally:
+                f.close()
         
         return StreamingResponse(
             iterfile_range(),
             status_code=206,  # Partial Content
             media_type=_get_content_type(filename),
             headers={
-                "Content-Disposition": f'attachment; filename="{filename}"',
+                **_STATIC_DL_HEADERS,
+                "Content-Disposition": _content_disposition(filename),
                 "Content-Length": str(content_length),
-                "Content-Range": f"bytes {start}-{end}/{file_size}",
-                "Accept-Ranges": "bytes"
+                "Content-Range": f"bytes {start}-{end}/{file_size}"
             }
         )
         
@@ -202,27 +382,66 @@ async def _handle_range_request(file_path: Path, filename: str, file_size: int,
         )
 
 
-def _get_content_type(filename: str) -> str:
-    """Determine content type based on file extension"""
-    ext = filename.lower().split('.')[-1] if '.' in filename else ''
-    
-    content_types = {
-        'jsonl': 'application/jsonl',
-        'json': 'application/json',
-        'csv': 'text/csv',
-        'txt': 'text/plain',
-        'xml': 'application/xml',
-        'pdf': 'application/pdf',
-        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        'xls': 'application/vnd.ms-excel'
-    }
-    
-    return content_types.get(ext, 'application/octet-stream')
+def _multipart_range_response(file_path: Path, filename: str, file_size: int, ranges: list):
+    """Build a multipart/byteranges response for multi-range requests"""
+    import uuid
 
+    boundary = uuid.uuid4().hex
+    content_type = _get_content_type(filename)
 
-# Import aiofiles for async file operations
-try:
-    import aiofiles
-except ImportError:
-    logger.warning("aiofiles not installed - falling back to sync file operations")
-    aiofiles = None
\ No newline at end of file
+    async def iter_parts():
+        def _open():
+            return open(file_path, 'rb')
+
+        f = await asyncio.to_thread(_open)
+        try:
+            for start, end in ranges:
+                yield (
+                    f"\r\n--{boundary}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+                ).encode("ascii")
+
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await asyncio.to_thread(f.read, min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+            yield f"\r\n--{boundary}--\r\n".encode("ascii")
+        finally:
+            f.close()
+
+    return StreamingResponse(
+        iter_parts(),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers={"Accept-Ranges": "bytes"}
+    )
+
+
+# Extension -> MIME type map, built once at import
+_CONTENT_TYPES = {
+    'jsonl': 'application/jsonl',
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'txt': 'text/plain',
+    'xml': 'application/xml',
+    'pdf': 'application/pdf',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'xls': 'application/vnd.ms-excel'
+}
+
+
+@lru_cache(maxsize=1024)
+def _ext_content_type(ext: str) -> str:
+    """Look up content type for a lowercased extension"""
+    return _CONTENT_TYPES.get(ext, 'application/octet-stream')
+
+
+def _get_content_type(filename: str) -> str:
+    """Determine content type based on file extension"""
+    _, sep, ext = filename.rpartition('.')
+    return _ext_content_type(ext.lower() if sep else '')
\ No newline at end of file
@@ -4,28 +4,49 @@ Wolfstitch Cloud - Processing API
 Enhanced with full processing capabilities for complete file exports
 """
 
+import hashlib
 import os
+import re
+import secrets
 import uuid
 import tempfile
 import logging
 import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Form, Depends
+from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Form, Depends, Request
 from fastapi.responses import JSONResponse
 
+# Prefer orjson's C-speed serializer for the chunk-heavy responses
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    DefaultJSONResponse = JSONResponse
+
+# aiofiles keeps upload writes off the event loop
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
 from backend.models.schemas import (
     ProcessingConfig,
     ProcessingStatus,
     JobStatusResponse,
     ProcessingResult
 )
+from backend.config import settings
 from backend.dependencies import get_current_user, get_rate_limiter
 from backend.services.export_service import ExportService
 from backend.services.storage_service import StorageService
-from pathlib import Path
+from backend.services.job_store import JobStore
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +54,9 @@ logger = logging.getLogger(__name__)
 export_service = ExportService()
 storage_service = StorageService()
 
-router = APIRouter()
+# orjson (when present) serializes every response on this router,
+# skipping the pure-Python json.dumps tree walk
+router = APIRouter(default_response_class=DefaultJSONResponse)
 
 # Import wolfcore if available
 try:
@@ -43,22 +66,202 @@ except ImportError:
     logger.warning("Wolfcore not available - using basic processing")
     WOLFCORE_AVAILABLE = False
 
-# In-memory job storage (will be replaced with Redis/DB in production)
-processing_jobs: Dict[str, Dict[str, Any]] = {}
+# Job state lives in Redis (with in-memory fallback for development)
+job_store = JobStore()
+
+# Created once at import; saves a makedirs/stat round-trip per upload
+_UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "./uploads"))
+_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+# Collapses anything outside [A-Za-z0-9_.-] so client-supplied names
+# can't traverse paths or smuggle separators into upload filenames
+_SAFE_RE = re.compile(r'[^\w.\-]+')
+
+# Preview temp files are written once and re-read immediately, so put
+# them on tmpfs when the host has one - the round-trip stays in memory
+# instead of costing disk IOPS. Containers often cap /dev/shm at 64 MB
+# (below MAX_FILE_SIZE_MB), so _scratch_dir checks free space per
+# upload; WOLFSTITCH_SCRATCH_DIR overrides, empty disables.
+_SCRATCH_DIR = os.getenv(
+    "WOLFSTITCH_SCRATCH_DIR",
+    "/dev/shm" if os.path.isdir("/dev/shm") else ""
+) or None
+
+
+def _scratch_dir(expected_size):
+    """Pick the temp dir for an upload: tmpfs if it has room, else default.
+
+    expected_size is the declared Content-Length; when the header is
+    missing, the configured max upload size is assumed so a capped
+    /dev/shm never takes a file it might not fit. Falls back to the
+    default temp dir (None) rather than risking ENOSPC mid-write.
+    """
+    if _SCRATCH_DIR is None:
+        return None
+    if expected_size is None:
+        expected_size = settings.max_file_size_bytes
+    try:
+        stat = os.statvfs(_SCRATCH_DIR)
+    except OSError:
+        return None
+    if expected_size > stat.f_bavail * stat.f_frsize:
+        return None
+    return _SCRATCH_DIR
+
+# Shared processor instance - construction builds a FileParser, so pay
+# that once instead of per request. Per-call overrides are merged into a
+# fresh config inside process_file_async, so sharing is safe.
+_processor = None
+
+
+def _get_processor():
+    """Return the shared Wolfstitch processor, constructing it on first use"""
+    global _processor
+    if _processor is None:
+        _processor = Wolfstitch()
+    return _processor
+
+
+# Full-processing jobs are CPU-bound (parse, clean, tokenize, chunk) and
+# used to run on the API worker's event loop. A small process pool keeps
+# that work off the loop and lets concurrent jobs use separate cores.
+# Created lazily so workers that never see a full-processing job don't
+# pay for idle subprocesses.
+_process_pool = None
+
+
+def _get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2)
+    return _process_pool
+
+
+def _process_file_in_subprocess(file_path, tokenizer, max_tokens, chunk_method, preserve_structure):
+    """Top-level worker so the process pool can pickle it.
+
+    Pool workers are long-lived, so this reuses the module-level
+    processor singleton: each worker builds its FileParser once and
+    serves every subsequent job with it.
+    """
+    return _get_processor().process_file(
+        file_path,
+        tokenizer=tokenizer,
+        max_tokens=max_tokens,
+        chunk_method=chunk_method,
+        preserve_structure=preserve_structure
+    )
+
+
+# Tokenization dominates processing cost, and the common flow runs the
+# same file through /quick-process and then /process-full with identical
+# settings. Cache recent results keyed by content digest + config so the
+# full run can reuse the preview's work. Kept deliberately small since
+# each entry holds a whole document's chunks.
+_RESULT_CACHE: Dict[tuple, tuple] = {}
+_RESULT_CACHE_TTL = 300.0
+_RESULT_CACHE_MAX = 4
+
+
+def _result_cache_key(content_digest, tokenizer, max_tokens, chunk_method, preserve_structure):
+    return (content_digest, tokenizer, max_tokens, chunk_method, preserve_structure)
+
+
+def _result_cache_get(key):
+    """Return a cached ProcessingResult or None if missing/expired"""
+    entry = _RESULT_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > _RESULT_CACHE_TTL:
+        del _RESULT_CACHE[key]
+        return None
+    return result
+
+
+def _result_cache_put(key, result):
+    """Cache a ProcessingResult, evicting the oldest entry when full"""
+    if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX and key not in _RESULT_CACHE:
+        oldest = min(_RESULT_CACHE, key=lambda k: _RESULT_CACHE[k][0])
+        del _RESULT_CACHE[oldest]
+    _RESULT_CACHE[key] = (time.monotonic(), result)
+
+
+# Maps (content digest, settings, export format) to the job that already
+# handled that exact upload, so retries and double-clicks return the
+# existing job instead of re-processing from scratch.
+_DEDUP_JOBS: Dict[tuple, tuple] = {}
+_DEDUP_TTL = 3600.0
+_DEDUP_MAX = 64
+
+
+def _dedup_get(key) -> Optional[str]:
+    """Return the job_id previously submitted for this key, if fresh"""
+    entry = _DEDUP_JOBS.get(key)
+    if entry is None:
+        return None
+    stored_at, job_id = entry
+    if time.monotonic() - stored_at > _DEDUP_TTL:
+        del _DEDUP_JOBS[key]
+        return None
+    return job_id
+
+
+def _dedup_put(key, job_id: str):
+    if len(_DEDUP_JOBS) >= _DEDUP_MAX and key not in _DEDUP_JOBS:
+        oldest = min(_DEDUP_JOBS, key=lambda k: _DEDUP_JOBS[k][0])
+        del _DEDUP_JOBS[oldest]
+    _DEDUP_JOBS[key] = (time.monotonic(), job_id)
+
+
+def _drain_upload(src, dst) -> str:
+    """Copy an upload's spool file to dst while hashing it.
+
+    Runs synchronously so callers can push the whole copy into one
+    worker thread when the spool has already rolled to disk, instead of
+    bouncing every chunk through the event loop. Returns the content
+    digest.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    while chunk := src.read(1024 * 1024):
+        dst.write(chunk)
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _check_upload_size(request: Request):
+    """Reject oversize uploads from Content-Length before buffering anything.
+
+    The declared size is checked against the configured limit so a
+    multi-GB upload is refused with a 413 up front instead of consuming
+    bandwidth and disk first. Bodies without a usable header still go
+    through (the stream-copy keeps memory bounded either way).
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and \
+            int(content_length) > settings.max_file_size_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE_MB}MB"
+        )
 
 
 async def cleanup_temp_file(file_path: str):
     """Clean up temporary file after processing"""
     try:
-        if os.path.exists(file_path):
-            os.unlink(file_path)
-            logger.debug(f"Cleaned up temp file: {file_path}")
+        # Single unlink off the loop; a missing file is fine and skipping
+        # the exists() pre-check avoids a syscall and a TOCTOU race
+        await asyncio.to_thread(os.unlink, file_path)
+        logger.debug("Cleaned up temp file: %s", file_path)
+    except FileNotFoundError:
+        pass
     except Exception as e:
-        logger.error(f"Error cleaning up temp file: {e}")
+        logger.error("Error cleaning up temp file: %s", e)
 
 
 @router.post("/quick-process")
 async def quick_process(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     tokenizer: Optional[str] = Form("gpt-4"),
@@ -72,6 +275,8 @@ async def quick_process(
     Quick processing endpoint for previews (existing functionality)
     Returns first 3 chunks with truncated text for UI preview
     """
+    _check_upload_size(request)
+
     # Rate limiting check
     if not await rate_limiter.check_processing_limit(user):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
@@ -82,29 +287,54 @@ async def quick_process(
     # Create temporary file
     temp_file = None
     try:
-        suffix = f".{file.filename.split('.')[-1]}" if '.' in file.filename else ""
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
+        # splitext returns just the dotted suffix ("" when there is none)
+        # without allocating a list like split would
+        suffix = os.path.splitext(file.filename)[1]
+        # Stream the upload to disk in chunks while hashing it, so memory
+        # stays O(chunk) instead of O(file) and the job ID is
+        # content-addressed (stable across retries of the same upload)
+        content_length = request.headers.get("content-length")
+        expected_size = int(content_length) if content_length and content_length.isdigit() else None
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=suffix,
+                                         dir=_scratch_dir(expected_size)) as tmp:
             temp_file = tmp.name
-        
-        logger.info(f"Processing file for preview: {file.filename}")
+            if getattr(file.file, "_rolled", False):
+                # Large upload already spilled to disk: disk-to-disk copy
+                # and hash in a single worker-thread pass
+                content_digest = await asyncio.to_thread(_drain_upload, file.file, tmp)
+            else:
+                hasher = hashlib.blake2b(digest_size=16)
+                while chunk := await file.read(1024 * 1024):
+                    # Write off the loop so a slow disk can't stall other requests
+                    await asyncio.to_thread(tmp.write, chunk)
+                    hasher.update(chunk)
+                content_digest = hasher.hexdigest()
+
+        logger.info("Processing file for preview: %s", file.filename)
         
         if WOLFCORE_AVAILABLE:
             try:
-                # Use wolfcore for processing
-                wf = Wolfstitch()
-                result = await wf.process_file_async(
-                    temp_file,
-                    tokenizer=tokenizer,
-                    max_tokens=max_tokens,
-                    chunk_method=chunk_method,
-                    preserve_structure=preserve_structure
+                cache_key = _result_cache_key(
+                    content_digest, tokenizer, max_tokens, chunk_method, preserve_structure
                 )
-                
+                result = _result_cache_get(cache_key)
+                if result is None:
+                    # Use wolfcore for processing
+                    wf = _get_processor()
+                    result = await wf.process_file_async(
+                        temp_file,
+                        tokenizer=tokenizer,
+                        max_tokens=max_tokens,
+                        chunk_method=chunk_method,
+                        preserve_structure=preserve_structure
+                    )
+                    # Keep the result around so a follow-up /process-full
+                    # of the same upload skips re-tokenization
+                    _result_cache_put(cache_key, result)
+
                 # Return preview response
                 response_data = {
-                    "job_id": f"quick-{uuid.uuid4().hex[:8]}",
+                    "job_id": f"quick-{content_digest[:16]}",
                     "total_chunks": result.total_chunks,
                     "total_tokens": result.total_tokens,
                     "processing_time": result.processing_time,
@@ -112,18 +342,21 @@ async def quick_process(
                     "enhanced": True,
                     "chunks": [
                         {
-                            "text": chunk.text[:100] if len(chunk.text) > 100 else chunk.text,
+                            # Slicing a short string is a no-op copy, so
+                            # skip the length branch
+                            "text": chunk.text[:100],
                             "token_count": chunk.token_count,
                             "chunk_index": chunk.chunk_index
                         }
-                        for chunk in result.chunks[:3]  # Preview: first 3 chunks only
+                        # islice stops after 3 without copying the list
+                        for chunk in islice(result.chunks, 3)
                     ],
                     "file_info": result.file_info,
                     "metadata": result.metadata
                 }
                 
             except Exception as e:
-                logger.warning(f"Enhanced processing failed: {e}, falling back to basic")
+                logger.warning("Enhanced processing failed: %s, falling back to basic", e)
                 response_data = await _basic_processing_fallback(temp_file, file.filename)
         else:
             response_data = await _basic_processing_fallback(temp_file, file.filename)
@@ -131,11 +364,11 @@ async def quick_process(
         # Schedule cleanup
         background_tasks.add_task(cleanup_temp_file, temp_file)
         
-        logger.info(f"Preview processing completed: {response_data['total_chunks']} chunks")
+        logger.info("Preview processing completed: %s chunks", response_data['total_chunks'])
         return response_data
         
     except Exception as e:
-        logger.error(f"Processing error: {e}")
+        logger.error("Processing error: %s", e)
         if temp_file:
             background_tasks.add_task(cleanup_temp_file, temp_file)
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
@@ -143,6 +376,7 @@ async def quick_process(
 
 @router.post("/process-full")
 async def process_full(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     tokenizer: Optional[str] = Form("gpt-4"),
@@ -157,6 +391,8 @@ async def process_full(
     Full processing endpoint that processes complete files without limits.
     Returns a job ID for tracking the processing status.
     """
+    _check_upload_size(request)
+
     # Rate limiting check
     if not await rate_limiter.check_processing_limit(user):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
@@ -172,32 +408,74 @@ async def process_full(
             detail=f"Invalid export format. Must be one of: {', '.join(valid_formats)}"
         )
     
-    # Create job ID
-    job_id = f"job-{uuid.uuid4().hex}"
-    
+    # Create job ID - .bytes.hex() skips the UUID string formatting that
+    # .hex goes through
+    job_id = f"job-{uuid.uuid4().bytes.hex()}"
+
+    # Save uploaded file under a sanitized name - one regex pass up
+    # front instead of trusting the client string everywhere downstream
+    safe_name = f"{job_id}_{_SAFE_RE.sub('_', file.filename)}"
+    file_path = str(_UPLOAD_DIR / safe_name)
+    # Copy the upload in bounded 1 MiB chunks instead of buffering the
+    # whole file in memory, using async writes so a slow disk doesn't
+    # stall other requests on this worker. Hash while copying so the
+    # background task can look for a cached preview result.
+    if getattr(file.file, "_rolled", False):
+        # Large upload already spilled to disk: disk-to-disk copy and
+        # hash in a single worker-thread pass
+        with open(file_path, "wb") as f:
+            content_digest = await asyncio.to_thread(_drain_upload, file.file, f)
+    else:
+        hasher = hashlib.blake2b(digest_size=16)
+        if aiofiles is not None:
+            async with aiofiles.open(file_path, "wb") as f:
+                while chunk := await file.read(1024 * 1024):
+                    await f.write(chunk)
+                    hasher.update(chunk)
+        else:
+            with open(file_path, "wb") as f:
+                while chunk := await file.read(1024 * 1024):
+                    # No aiofiles: push each write to the threadpool so
+                    # the loop isn't blocked on disk
+                    await asyncio.to_thread(f.write, chunk)
+                    hasher.update(chunk)
+        content_digest = hasher.hexdigest()
+
+    # Identical content + settings already submitted recently: hand back
+    # the existing job instead of processing the same bytes again
+    dedup_key = (content_digest, tokenizer, max_tokens, chunk_method,
+                 preserve_structure, export_format)
+    prior_job_id = _dedup_get(dedup_key)
+    if prior_job_id is not None:
+        prior = await job_store.get(prior_job_id)
+        if prior is not None and prior.get("status") != "failed":
+            await asyncio.to_thread(os.unlink, file_path)
+            logger.info("Duplicate upload, reusing job %s", prior_job_id)
+            return {
+                "job_id": prior_job_id,
+                "status": prior["status"],
+                "message": "Identical file already submitted with these settings.",
+                "status_url": f"/api/v1/jobs/{prior_job_id}/status",
+                "download_url": prior.get("download_url")
+            }
+
     # Initialize job status
-    processing_jobs[job_id] = {
+    await job_store.create(job_id, {
         "job_id": job_id,
         "status": "pending",
         "progress": 0,
         "filename": file.filename,
-        "created_at": datetime.utcnow().isoformat(),
+        # Stored as epoch nanoseconds; formatted lazily when a client
+        # actually asks for status
+        "created_at_ns": time.time_ns(),
         "export_format": export_format,
         "user_id": user.user_id,
         "error": None,
         "result": None,
         "download_url": None
-    }
-    
-    # Save uploaded file
-    upload_dir = os.getenv("UPLOAD_DIR", "./uploads")
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    file_path = os.path.join(upload_dir, f"{job_id}_{file.filename}")
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
+    })
+    _dedup_put(dedup_key, job_id)
+
     # Process in background
     background_tasks.add_task(
         _process_file_background,
@@ -210,7 +488,8 @@ async def process_full(
             chunk_method=chunk_method,
             preserve_structure=preserve_structure
         ),
-        export_format=export_format
+        export_format=export_format,
+        content_digest=content_digest
     )
     
     # Return job information
@@ -222,53 +501,96 @@ async def process_full(
     }
 
 
+# Progress-only writes are throttled so a long job emitting frequent
+# updates doesn't turn each one into a Redis round-trip
+_PROGRESS_MIN_INTERVAL = 0.25
+_last_progress_write: Dict[str, float] = {}
+
+
+async def _update_progress(job_id: str, progress: int, **fields: Any):
+    """Write job progress, coalescing bursts.
+
+    Progress-only writes within _PROGRESS_MIN_INTERVAL of the previous
+    one are dropped; writes carrying other fields (status changes,
+    results) always go through.
+    """
+    now = time.monotonic()
+    if not fields:
+        last = _last_progress_write.get(job_id)
+        if last is not None and now - last < _PROGRESS_MIN_INTERVAL:
+            return
+    _last_progress_write[job_id] = now
+    await job_store.update(job_id, progress=progress, **fields)
+
+
 async def _process_file_background(
     job_id: str,
     file_path: str,
     filename: str,
     config: ProcessingConfig,
-    export_format: str
+    export_format: str,
+    content_digest: Optional[str] = None
 ):
     """
     Background task to process file completely without limits
     """
     try:
         # Update status to processing
-        processing_jobs[job_id]["status"] = "processing"
-        processing_jobs[job_id]["progress"] = 10
+        await _update_progress(job_id, 10, status="processing")
         
-        logger.info(f"Starting full processing for job {job_id}, file: {filename}")
+        logger.info("Starting full processing for job %s, file: %s", job_id, filename)
         
         if not WOLFCORE_AVAILABLE:
             raise Exception("Wolfcore not available for full processing")
         
-        # Initialize processor
-        wf = Wolfstitch()
-        
         # Update progress
-        processing_jobs[job_id]["progress"] = 20
-        
-        # Process file completely - NO LIMITS
-        result = await wf.process_file_async(
-            file_path,
-            tokenizer=config.tokenizer,
-            max_tokens=config.max_tokens,
-            chunk_method=config.chunk_method,
-            preserve_structure=config.preserve_structure
-        )
+        await _update_progress(job_id, 20)
+
+        # Reuse the preview's tokenized result when this is the same
+        # content with the same settings; otherwise process from scratch
+        result = None
+        if content_digest is not None:
+            cache_key = _result_cache_key(
+                content_digest, config.tokenizer, config.max_tokens,
+                config.chunk_method, config.preserve_structure
+            )
+            result = _result_cache_get(cache_key)
+            if result is not None:
+                logger.info("Reusing cached preview result for job %s", job_id)
+
+        if result is None:
+            # Process file completely - NO LIMITS. Runs in the process
+            # pool so CPU-heavy tokenization doesn't stall the event loop
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    _get_process_pool(),
+                    _process_file_in_subprocess,
+                    file_path,
+                    config.tokenizer,
+                    config.max_tokens,
+                    config.chunk_method,
+                    config.preserve_structure
+                )
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning("Process pool unavailable (%s), processing inline", e)
+                wf = _get_processor()
+                result = await wf.process_file_async(
+                    file_path,
+                    tokenizer=config.tokenizer,
+                    max_tokens=config.max_tokens,
+                    chunk_method=config.chunk_method,
+                    preserve_structure=config.preserve_structure
+                )
         
         # Update progress
-        processing_jobs[job_id]["progress"] = 70
+        await _update_progress(job_id, 70)
         
-        # Store complete result with ALL chunks
-        processing_result = {
-            "filename": filename,
-            "total_chunks": result.total_chunks,
-            "total_tokens": result.total_tokens,
-            "total_characters": result.total_characters,
-            "processing_time": result.processing_time,
-            "chunks": [
-                {
+        # Build the export payload with chunks as a generator, so the full
+        # chunk dicts are written straight to the export file one at a time
+        # instead of being materialized as a second copy of the document
+        def iter_export_chunks():
+            for idx, chunk in enumerate(result.chunks):  # ALL CHUNKS - NO LIMIT
+                yield {
                     "chunk_id": idx + 1,
                     "text": chunk.text,  # FULL TEXT - NO TRUNCATION
                     "tokens": chunk.token_count,
@@ -280,19 +602,27 @@ async def _process_file_background(
                         "chunk_index": getattr(chunk, 'chunk_index', idx)  # Use chunk_index if available
                     }
                 }
-                for idx, chunk in enumerate(result.chunks)  # ALL CHUNKS - NO LIMIT
-            ],
+
+        processing_result = {
+            "filename": filename,
+            "total_chunks": result.total_chunks,
+            "total_tokens": result.total_tokens,
+            "total_characters": result.total_characters,
+            "processing_time": result.processing_time,
+            "chunks": iter_export_chunks(),
             "file_info": result.file_info,
             "metadata": {
                 **result.metadata,
                 "export_format": export_format,
+                "chunk_method": config.chunk_method,
+                "tokenizer": config.tokenizer,
                 "job_id": job_id,
                 "processed_at": datetime.utcnow().isoformat()
             }
         }
-        
+
         # Update progress
-        processing_jobs[job_id]["progress"] = 90
+        await _update_progress(job_id, 90)
         
         # Generate export file using export service
         export_info = await export_service.generate_export(
@@ -302,36 +632,48 @@ async def _process_file_background(
         )
         
         # Store the export file and get download URL
+        job = await job_store.get(job_id)
         storage_info = await storage_service.store_export_file(
             source_path=Path(export_info["file_path"]),
             job_id=job_id,
-            user_id=processing_jobs[job_id].get("user_id")
+            user_id=job.get("user_id") if job else None
         )
         
-        # Update job with download information
-        processing_jobs[job_id]["download_url"] = storage_info["download_url"]
-        processing_jobs[job_id]["export_info"] = export_info
-        processing_jobs[job_id]["storage_info"] = storage_info
-        
-        # Store the result
-        processing_jobs[job_id]["result"] = processing_result
-        
-        # Update job status
-        processing_jobs[job_id]["status"] = "completed"
-        processing_jobs[job_id]["progress"] = 100
-        processing_jobs[job_id]["completed_at"] = datetime.utcnow().isoformat()
+        # Update job with download information and final status. Only the
+        # result summary is kept - the full chunks are on disk in the export
+        await job_store.update(
+            job_id,
+            download_url=storage_info["download_url"],
+            export_info=export_info,
+            storage_info=storage_info,
+            result={
+                "filename": filename,
+                "total_chunks": result.total_chunks,
+                "total_tokens": result.total_tokens,
+                "total_characters": result.total_characters,
+                "processing_time": result.processing_time
+            },
+            status="completed",
+            progress=100,
+            completed_at_ns=time.time_ns()
+        )
+        _last_progress_write.pop(job_id, None)
         
         # Clean up uploaded file
         if os.path.exists(file_path):
             os.unlink(file_path)
         
-        logger.info(f"Full processing completed for job {job_id}: {result.total_chunks} chunks")
+        logger.info("Full processing completed for job %s: %d chunks", job_id, result.total_chunks)
         
     except Exception as e:
-        logger.error(f"Error processing job {job_id}: {str(e)}")
-        processing_jobs[job_id]["status"] = "failed"
-        processing_jobs[job_id]["error"] = str(e)
-        processing_jobs[job_id]["failed_at"] = datetime.utcnow().isoformat()
+        logger.error("Error processing job %s: %s", job_id, e)
+        await job_store.update(
+            job_id,
+            status="failed",
+            error=str(e),
+            failed_at_ns=time.time_ns()
+        )
+        _last_progress_write.pop(job_id, None)
         
         # Clean up on error
         if os.path.exists(file_path):
@@ -341,29 +683,74 @@ async def _process_file_background(
                 pass
 
 
+# Compiled once at import; re.finditer with a string pattern pays a
+# regex-cache lookup on every call
+_WORD_RE = re.compile(r'\S+')
+
+
+def _scan_paragraphs(temp_file: str, preview_limit: int = 3):
+    """Stream a file paragraph-by-paragraph for the basic fallback.
+
+    Counts every paragraph and its words but keeps only the first
+    preview_limit texts, so peak memory is one paragraph rather than
+    the whole document. Words are counted with finditer instead of
+    split(), which avoids allocating a word list just to measure it.
+    Returns (previews, total_chunks, total_tokens) where previews is a
+    list of (text, word_count) pairs.
+    """
+    previews = []
+    total_chunks = 0
+    total_tokens = 0
+    para_lines = []
+
+    def _flush():
+        nonlocal total_chunks, total_tokens
+        text = '\n'.join(para_lines).strip()
+        para_lines.clear()
+        if not text:
+            return
+        words = sum(1 for _ in _WORD_RE.finditer(text))
+        total_chunks += 1
+        total_tokens += words
+        if len(previews) < preview_limit:
+            previews.append((text, words))
+
+    with open(temp_file, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if line.strip():
+                para_lines.append(line.rstrip('\n'))
+            elif para_lines:
+                _flush()
+        if para_lines:
+            _flush()
+
+    return previews, total_chunks, total_tokens
+
+
 async def _basic_processing_fallback(temp_file: str, filename: str):
     """Fallback to basic processing if enhanced modules unavailable"""
     try:
-        with open(temp_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        # Basic chunking by paragraphs
-        chunks = [p.strip() for p in content.split('\n\n') if p.strip()]
-        
+        # Parsing is CPU-bound; run it off the event loop
+        previews, total_chunks, total_tokens = await asyncio.to_thread(
+            _scan_paragraphs, temp_file
+        )
+
         return {
-            "job_id": f"basic-{uuid.uuid4().hex[:8]}",
-            "total_chunks": len(chunks),
-            "total_tokens": sum(len(chunk.split()) for chunk in chunks),
+            # token_urlsafe emits exactly the entropy needed instead of
+            # formatting a 32-char UUID and slicing most of it away
+            "job_id": f"basic-{secrets.token_urlsafe(6)}",
+            "total_chunks": total_chunks,
+            "total_tokens": total_tokens,
             "processing_time": 0.1,
             "status": "completed",
             "enhanced": False,
             "chunks": [
                 {
-                    "text": chunk[:100] if len(chunk) > 100 else chunk,
-                    "token_count": len(chunk.split()),
+                    "text": text[:100],
+                    "token_count": words,
                     "chunk_index": i
                 }
-                for i, chunk in enumerate(chunks[:3])
+                for i, (text, words) in enumerate(previews)
             ],
             "file_info": {
                 "filename": filename,
@@ -375,37 +762,43 @@ async def _basic_processing_fallback(temp_file: str, filename: str):
             }
         }
     except Exception as e:
-        logger.error(f"Basic processing failed: {e}")
+        logger.error("Basic processing failed: %s", e)
         raise
 
 
+def _iso_from_ns(ns):
+    """Format stored epoch nanoseconds as an ISO timestamp"""
+    if ns is None:
+        return None
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+
 # Job status endpoint (basic implementation for now)
 @router.get("/jobs/{job_id}/status")
 async def get_job_status(job_id: str):
     """Get the status of a processing job"""
-    if job_id not in processing_jobs:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = processing_jobs[job_id]
-    
     # Build response
     response = {
         "job_id": job_id,
         "status": job["status"],
         "progress": job["progress"],
         "filename": job["filename"],
-        "created_at": job["created_at"],
+        "created_at": _iso_from_ns(job.get("created_at_ns")),
         "export_format": job["export_format"]
     }
     
     # Add error info if failed
     if job["status"] == "failed":
         response["error"] = job["error"]
-        response["failed_at"] = job.get("failed_at")
+        response["failed_at"] = _iso_from_ns(job.get("failed_at_ns"))
     
     # Add completion info if done
     elif job["status"] == "completed":
-        response["completed_at"] = job.get("completed_at")
+        response["completed_at"] = _iso_from_ns(job.get("completed_at_ns"))
         response["download_url"] = job.get("download_url")
         response["total_chunks"] = job["result"]["total_chunks"] if job["result"] else None
         response["total_tokens"] = job["result"]["total_tokens"] if job["result"] else None
@@ -4,11 +4,67 @@ Wolfstitch Cloud - Application Configuration
 Environment-aware configuration management for dev/prod domains
 """
 
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Optional
+from typing import Optional, Tuple
 import os
 from pathlib import Path
+from types import MappingProxyType
+
+
+# Environment -> default endpoint tables, built once at import so the
+# validators below do a single lookup instead of rebuilding literals on
+# every Settings construction
+_API_URLS = {
+    "production": "https://api.wolfstitch.dev",
+    "development": "https://api-dev.wolfstitch.dev",
+    "staging": "https://api-dev.wolfstitch.dev",
+    "dev": "https://api-dev.wolfstitch.dev",
+}
+
+_FRONTEND_URLS = {
+    "production": "https://app.wolfstitch.dev",
+    "development": "https://dev.wolfstitch.dev",
+    "staging": "https://dev.wolfstitch.dev",
+    "dev": "https://dev.wolfstitch.dev",
+}
+
+_BASE_ORIGINS = (
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+)
+_PROD_ORIGINS = (
+    "https://wolfstitch.dev",
+    "https://www.wolfstitch.dev",
+    "https://app.wolfstitch.dev",
+)
+_DEV_ORIGINS = (
+    "https://wolfstitch.dev",
+    "https://www.wolfstitch.dev",
+    "https://dev.wolfstitch.dev",
+    "https://api-dev.wolfstitch.dev",
+)
+
+# Base hosts that are always allowed
+_BASE_HOSTS = (
+    "*.railway.app",
+    "*.up.railway.app",
+    "localhost",
+    "127.0.0.1",
+)
+_PROD_HOSTS = (
+    "api.wolfstitch.dev",
+    "wolfstitch.dev",
+    "app.wolfstitch.dev",
+    "www.wolfstitch.dev",
+)
+_DEV_HOSTS = (
+    "api-dev.wolfstitch.dev",
+    "dev.wolfstitch.dev",
+    "wolfstitch.dev",
+    "www.wolfstitch.dev",
+)
 
 
 class Settings(BaseSettings):
@@ -22,6 +78,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     API_VERSION: str = "v1"
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "json" switches the console to JSON records
+    LOG_TO_FILE: bool = True  # rotating file handler in production
     
     # =============================================================================
     # DOMAIN CONFIGURATION - Environment-aware
@@ -37,14 +95,8 @@ class Settings(BaseSettings):
             return v
         
         environment = info.data.get("ENVIRONMENT", "development").lower()
-        
-        if environment == "production":
-            return "https://api.wolfstitch.dev"
-        elif environment in ["development", "staging", "dev"]:
-            return "https://api-dev.wolfstitch.dev"
-        else:
-            # Fallback for local development
-            return "http://localhost:8000"
+        # Fallback covers local setups with unrecognized environments
+        return _API_URLS.get(environment, "http://localhost:8000")
     
     @field_validator("FRONTEND_URL", mode="before") 
     @classmethod
@@ -54,14 +106,7 @@ class Settings(BaseSettings):
             return v
             
         environment = info.data.get("ENVIRONMENT", "development").lower()
-        
-        if environment == "production":
-            return "https://app.wolfstitch.dev"
-        elif environment in ["development", "staging", "dev"]:
-            return "https://dev.wolfstitch.dev"
-        else:
-            # Fallback for local development
-            return "http://localhost:3000"
+        return _FRONTEND_URLS.get(environment, "http://localhost:3000")
     
     # =============================================================================
     # DATABASE CONFIGURATION  
@@ -90,7 +135,7 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE_MB: int = 100
     FILE_RETENTION_HOURS: int = 24
     
-    ALLOWED_FILE_EXTENSIONS: List[str] = [
+    ALLOWED_FILE_EXTENSIONS: Tuple[str, ...] = (
         # Documents
         "pdf", "docx", "txt", "epub", "html", "md", "rtf",
         # Spreadsheets  
@@ -101,13 +146,13 @@ class Settings(BaseSettings):
         "py", "js", "ts", "java", "cpp", "c", "cs", "php", "rb", "go", "rs",
         # Data files
         "json", "jsonl", "xml", "yaml", "yml"
-    ]
+    )
     
     # =============================================================================
     # CORS AND SECURITY - Environment-aware
     # =============================================================================
-    ALLOWED_ORIGINS: Optional[List[str]] = None
-    ALLOWED_HOSTS: Optional[List[str]] = None
+    ALLOWED_ORIGINS: Optional[Tuple[str, ...]] = None
+    ALLOWED_HOSTS: Optional[Tuple[str, ...]] = None
     
     @field_validator("ALLOWED_ORIGINS", mode="before")
     @classmethod
@@ -123,24 +168,10 @@ class Settings(BaseSettings):
             
         environment = info.data.get("ENVIRONMENT", "development").lower()
         
-        base_origins = [
-            "http://localhost:3000",
-            "http://127.0.0.1:3000"
-        ]
-        
         if environment == "production":
-            return base_origins + [
-                "https://wolfstitch.dev",
-                "https://www.wolfstitch.dev", 
-                "https://app.wolfstitch.dev"
-            ]
+            return _BASE_ORIGINS + _PROD_ORIGINS
         else:
-            return base_origins + [
-                "https://wolfstitch.dev",
-                "https://www.wolfstitch.dev",
-                "https://dev.wolfstitch.dev",
-                "https://api-dev.wolfstitch.dev"
-            ]
+            return _BASE_ORIGINS + _DEV_ORIGINS
     
     @field_validator("ALLOWED_HOSTS", mode="before")
     @classmethod
@@ -156,28 +187,10 @@ class Settings(BaseSettings):
             
         environment = info.data.get("ENVIRONMENT", "development").lower()
         
-        # Base hosts that are always allowed
-        base_hosts = [
-            "*.railway.app", 
-            "*.up.railway.app",
-            "localhost",
-            "127.0.0.1"
-        ]
-        
         if environment == "production":
-            return base_hosts + [
-                "api.wolfstitch.dev",
-                "wolfstitch.dev",
-                "app.wolfstitch.dev",
-                "www.wolfstitch.dev"
-            ]
+            return _BASE_HOSTS + _PROD_HOSTS
         else:
-            return base_hosts + [
-                "api-dev.wolfstitch.dev",
-                "dev.wolfstitch.dev",
-                "wolfstitch.dev",
-                "www.wolfstitch.dev"
-            ]
+            return _BASE_HOSTS + _DEV_HOSTS
     
     # =============================================================================
     # PROCESSING CONFIGURATION
@@ -212,13 +225,6 @@ class Settings(BaseSettings):
     # =============================================================================
     # VALIDATION AND COMPUTED PROPERTIES
     # =============================================================================
-    @field_validator("UPLOAD_DIR", "STORAGE_DIR", "EXPORT_DIR", mode="before")
-    @classmethod
-    def create_directories(cls, v):
-        """Ensure directories exist"""
-        Path(v).mkdir(parents=True, exist_ok=True)
-        return v
-    
     @field_validator("MAX_FILE_SIZE_MB")
     @classmethod
     def validate_file_size(cls, v):
@@ -232,43 +238,86 @@ class Settings(BaseSettings):
         """Get max file size in bytes"""
         return self.MAX_FILE_SIZE_MB * 1024 * 1024
     
+    @cached_property
+    def allowed_extensions(self) -> frozenset:
+        """ALLOWED_FILE_EXTENSIONS as a frozenset for O(1) lookups"""
+        return frozenset(self.ALLOWED_FILE_EXTENSIONS)
+
+    @cached_property
+    def _environment_normalized(self) -> str:
+        """Lowercased ENVIRONMENT, computed once per instance"""
+        return self.ENVIRONMENT.lower()
+
     @property
     def is_production(self) -> bool:
         """Check if running in production"""
-        return self.ENVIRONMENT.lower() == "production"
-    
+        return self._environment_normalized == "production"
+
     @property
     def is_development(self) -> bool:
         """Check if running in development"""
-        return self.ENVIRONMENT.lower() in ["development", "dev"]
-    
+        return self._environment_normalized in ("development", "dev")
+
     @property
     def is_staging(self) -> bool:
         """Check if running in staging"""
-        return self.ENVIRONMENT.lower() == "staging"
+        return self._environment_normalized == "staging"
     
-    @property
+    @cached_property
     def database_url_async(self) -> str:
-        """Get async database URL for SQLAlchemy"""
-        if self.DATABASE_URL.startswith("sqlite"):
+        """Get async database URL for SQLAlchemy, computed once per instance"""
+        if self.DATABASE_URL.startswith(("sqlite://", "sqlite+")):
             return self.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
         elif self.DATABASE_URL.startswith("postgresql"):
             return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
         return self.DATABASE_URL
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    # frozen=True lets pydantic skip revalidation-on-assignment and makes
+    # the tuple defaults safe to share without defensive copies
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True,
+    )
+
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the Settings instance once per process"""
+    return Settings()
 
-# Global settings instance
-settings = Settings()
+
+def __getattr__(name):
+    # PEP 562 lazy module attribute: `from backend.config import settings`
+    # keeps working, but the pydantic validation cost is paid on first
+    # use instead of at import, and exactly once per process
+    if name == "settings":
+        return get_settings()
+    if name == "ALLOWED_EXT_SET":
+        # Memoized into module globals so later lookups skip __getattr__
+        ext_set = get_settings().allowed_extensions
+        globals()["ALLOWED_EXT_SET"] = ext_set
+        return ext_set
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def ensure_runtime_dirs():
+    """Create the upload/storage/export directories if missing
+
+    Called once from application startup; keeps filesystem side effects
+    out of Settings validation so constructing the model stays pure.
+    """
+    s = get_settings()
+    for directory in (s.UPLOAD_DIR, s.STORAGE_DIR, s.EXPORT_DIR):
+        Path(directory).mkdir(parents=True, exist_ok=True)
 
 
 # Logging configuration based on environment
+@lru_cache(maxsize=1)
 def get_logging_config():
     """Get logging configuration based on environment"""
+    settings = get_settings()
     base_config = {
         "version": 1,
         "disable_existing_loggers": False,
@@ -279,10 +328,6 @@ def get_logging_config():
             "detailed": {
                 "format": "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s",
             },
-            "json": {
-                "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
-                "class": "pythonjsonlogger.jsonlogger.JsonFormatter"
-            }
         },
         "handlers": {
             "console": {
@@ -314,8 +359,16 @@ def get_logging_config():
         }
     }
     
+    # Only declare the JSON formatter when it's in use - dictConfig
+    # resolves the entry even if no handler uses it
+    if settings.LOG_FORMAT == "json":
+        base_config["formatters"]["json"] = {
+            "()": "backend.logconf.OrjsonFormatter"
+        }
+        base_config["handlers"]["console"]["formatter"] = "json"
+    
     # Add file handler in production
-    if settings.is_production:
+    if settings.is_production and settings.LOG_TO_FILE:
         base_config["handlers"]["file"] = {
             "formatter": "detailed",
             "class": "logging.handlers.RotatingFileHandler",
@@ -330,9 +383,15 @@ def get_logging_config():
 
 
 # Environment-specific configurations
+@lru_cache(maxsize=1)
 def get_environment_config():
-    """Get environment-specific configuration summary"""
-    return {
+    """Get environment-specific configuration summary
+
+    Settings are frozen after startup, so the snapshot is computed once
+    and served as a read-only view.
+    """
+    settings = get_settings()
+    return MappingProxyType({
         "environment": settings.ENVIRONMENT,
         "is_production": settings.is_production,
         "is_development": settings.is_development,
@@ -343,4 +402,4 @@ def get_environment_config():
         "allowed_hosts": settings.ALLOWED_HOSTS[:3] if settings.ALLOWED_HOSTS else [],  # First 3 for logs
         "debug": settings.DEBUG,
         "log_level": settings.LOG_LEVEL
-    }
\ No newline at end of file
+    })
\ No newline at end of file
@@ -3,48 +3,50 @@ Wolfstitch Cloud - Database Configuration
 Week 1 implementation with SQLite
 """
 
-import asyncio
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from backend.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create base class for models
-Base = declarative_base()
 
-# Create engines
-if settings.DATABASE_URL.startswith("sqlite"):
-    # SQLite for development
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-    
-    # For async operations, use aiosqlite
+class Base(DeclarativeBase):
+    """Declarative base for ORM models"""
+    pass
+
+
+# Single dialect check shared by the engine setup below
+_is_sqlite = settings.DATABASE_URL.startswith(("sqlite://", "sqlite+"))
+
+# Async engine - the only engine the routes use
+if _is_sqlite:
+    # aiosqlite connections are cheap to open and not safe to share
+    # across threads, so skip pooling entirely
     async_engine = create_async_engine(
         settings.database_url_async,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
     )
 else:
-    # PostgreSQL for production
-    engine = create_engine(settings.DATABASE_URL)
-    async_engine = create_async_engine(settings.database_url_async)
+    # PostgreSQL for production - keep warm pooled connections and
+    # verify them before handing out (pre_ping survives idle resets)
+    async_engine = create_async_engine(
+        settings.database_url_async,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+    )
 
-# Create session makers
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-AsyncSessionLocal = sessionmaker(
-    async_engine, class_=AsyncSession, expire_on_commit=False
-)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 async def create_tables():
     """Create database tables"""
     try:
         # For Week 1, we'll create tables when we have models
         # For now, just ensure the database file exists for SQLite
-        if settings.DATABASE_URL.startswith("sqlite"):
+        if _is_sqlite:
             # SQLite will create the file when we first connect
             pass
         
@@ -56,16 +58,6 @@ async def create_tables():
 
 async def get_db():
     """Get database session"""
+    # The context manager already closes the session on exit
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
-
-def get_sync_db():
-    """Get synchronous database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+        yield session
\ No newline at end of file
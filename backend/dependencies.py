@@ -3,15 +3,23 @@ Wolfstitch Cloud - Dependencies
 Simplified dependency injection for Week 1 implementation
 """
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, status
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Security scheme for JWT tokens
-security = HTTPBearer(auto_error=False)
+
+def _token(request: Request) -> Optional[str]:
+    """Extract the bearer token from the Authorization header
+
+    Lighter than HTTPBearer: one header lookup and a slice, no
+    HTTPAuthorizationCredentials model construction per request.
+    """
+    header = request.headers.get("authorization")
+    if header and header[:7].lower() == "bearer ":
+        return header[7:]
+    return None
 
 
 class MockUser:
@@ -42,9 +50,14 @@ class MockRateLimiter:
         return True
 
 
-async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
-) -> MockUser:
+# Shared singletons - the mocks are stateless, so every request can get
+# the same instance instead of a fresh allocation per dependency call
+_RATE_LIMITER = MockRateLimiter()
+_ANON_USER = MockUser(user_id="dev-user", tier="free")
+_AUTH_USER = MockUser(user_id="authenticated-user", tier="pro")
+
+
+def get_current_user(token: Optional[str] = Depends(_token)) -> MockUser:
     """
     Get current user from JWT token
     For Week 1: Returns mock user for development
@@ -52,31 +65,29 @@ async def get_current_user(
     # For Week 1 development, return a mock user
     # In Week 2, we'll implement real JWT token validation
     
-    if credentials and credentials.credentials:
+    if token:
         # Token provided - validate it (Week 2 implementation)
-        logger.info(f"Token provided: {credentials.credentials[:20]}...")
-        return MockUser(user_id="authenticated-user", tier="pro")
+        logger.info(f"Token provided: {token[:20]}...")
+        return _AUTH_USER
     else:
         # No token - return basic user for development
-        return MockUser(user_id="dev-user", tier="free")
+        return _ANON_USER
 
 
-async def get_rate_limiter() -> MockRateLimiter:
+def get_rate_limiter() -> MockRateLimiter:
     """
     Get rate limiter instance
     For Week 1: Returns mock limiter
     """
-    return MockRateLimiter()
+    return _RATE_LIMITER
 
 
-async def get_authenticated_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> MockUser:
+def get_authenticated_user(token: Optional[str] = Depends(_token)) -> MockUser:
     """
     Get authenticated user (requires token)
     For Week 1: Simplified validation
     """
-    if not credentials:
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required",
@@ -85,15 +96,13 @@ async def get_authenticated_user(
     
     # For Week 1, accept any token as valid
     # In Week 2, we'll validate JWT tokens properly
-    return MockUser(user_id="authenticated-user", tier="pro")
+    return _AUTH_USER
 
 
 # Optional dependencies (don't require authentication)
-async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
-) -> Optional[MockUser]:
+def get_optional_user(token: Optional[str] = Depends(_token)) -> Optional[MockUser]:
     """Get user if authenticated, None otherwise"""
     try:
-        return await get_current_user(credentials)
+        return get_current_user(token)
     except:
         return None
\ No newline at end of file
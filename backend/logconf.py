@@ -0,0 +1,30 @@
+"""
+Wolfstitch Cloud - Logging Formatters
+JSON log formatter backed by orjson for production log streams
+"""
+
+import json
+import logging
+
+# orjson serializes small dicts several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON, preferring orjson"""
+
+    def format(self, record):
+        payload = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(payload).decode()
+        return json.dumps(payload, ensure_ascii=False)
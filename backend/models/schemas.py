@@ -4,7 +4,7 @@ Wolfstitch Cloud - Pydantic Schemas
 Request and response models for API endpoints
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from enum import Enum
@@ -109,9 +109,10 @@ class ProcessingConfig(BaseModel):
     normalize_whitespace: bool = Field(default=True, description="Normalize whitespace")
     min_chunk_size: int = Field(default=50, ge=10, le=1000)
     
-    @validator('custom_delimiter')
-    def validate_custom_delimiter(cls, v, values):
-        if values.get('chunking_method') == 'custom' and not v:
+    @field_validator('custom_delimiter')
+    @classmethod
+    def validate_custom_delimiter(cls, v, info):
+        if info.data.get('chunking_method') == 'custom' and not v:
             raise ValueError('custom_delimiter required when chunking_method is custom')
         return v
 
@@ -4,6 +4,7 @@ Wolfstitch Cloud - Export Service
 Generates complete export files in various formats (JSONL, JSON, CSV)
 """
 
+import asyncio
 import json
 import csv
 import os
@@ -13,9 +14,22 @@ from typing import Dict, Any, List, Optional
 from pathlib import Path
 import logging
 
+# orjson serializes dict+str payloads several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dump_jsonl_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize one JSONL row to bytes, preferring orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+
 class ExportService:
     """Service for generating export files from processed data"""
     
@@ -41,7 +55,8 @@ class ExportService:
         
         Args:
             job_id: Unique job identifier
-            processing_result: Complete processing results with all chunks
+            processing_result: Processing results; "chunks" may be any
+                iterable (including a one-shot generator) of chunk dicts
             export_format: Format for export (jsonl, json, csv)
             
         Returns:
@@ -50,19 +65,22 @@ class ExportService:
         try:
             logger.info(f"Generating {export_format} export for job {job_id}")
             
-            # Generate filename with timestamp
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            # One timestamp per export, reused for the filename and metadata
+            now = datetime.utcnow()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             base_filename = processing_result.get("filename", "export").replace(".", "_")
             filename = f"{base_filename}_{timestamp}_{job_id[:8]}.{export_format}"
             file_path = self.export_dir / filename
             
-            # Generate export based on format
+            # Generate export based on format. The writers are
+            # synchronous and run in a worker thread so serialization and
+            # disk writes don't block the event loop
             if export_format == "jsonl":
-                await self._generate_jsonl(file_path, processing_result)
+                await asyncio.to_thread(self._generate_jsonl, file_path, processing_result)
             elif export_format == "json":
-                await self._generate_json(file_path, processing_result)
+                await asyncio.to_thread(self._generate_json, file_path, processing_result)
             elif export_format == "csv":
-                await self._generate_csv(file_path, processing_result)
+                await asyncio.to_thread(self._generate_csv, file_path, processing_result)
             else:
                 raise ValueError(f"Unsupported export format: {export_format}")
             
@@ -76,7 +94,7 @@ class ExportService:
                 "format": export_format,
                 "size_bytes": file_size,
                 "size_readable": self._format_file_size(file_size),
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": now.isoformat(),
                 "chunks_count": processing_result.get("total_chunks", 0),
                 "tokens_count": processing_result.get("total_tokens", 0)
             }
@@ -88,22 +106,24 @@ class ExportService:
             logger.error(f"Error generating export for job {job_id}: {str(e)}")
             raise
     
-    async def _generate_jsonl(self, file_path: Path, processing_result: Dict[str, Any]):
+    def _generate_jsonl(self, file_path: Path, processing_result: Dict[str, Any]):
         """Generate JSONL export with complete chunks"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            # Write metadata as first line
+        with open(file_path, 'wb') as f:
+            # Write metadata as first line - read settings from the result
+            # metadata, since chunks may be a one-shot generator
+            result_metadata = processing_result.get("metadata", {})
             metadata = {
                 "_metadata": {
                     "filename": processing_result.get("filename"),
-                    "job_id": processing_result.get("metadata", {}).get("job_id"),
-                    "processed_at": processing_result.get("metadata", {}).get("processed_at"),
+                    "job_id": result_metadata.get("job_id"),
+                    "processed_at": result_metadata.get("processed_at"),
                     "total_chunks": processing_result.get("total_chunks"),
                     "total_tokens": processing_result.get("total_tokens"),
-                    "chunk_method": processing_result.get("chunks", [{}])[0].get("metadata", {}).get("chunk_method"),
-                    "tokenizer": processing_result.get("chunks", [{}])[0].get("metadata", {}).get("tokenizer")
+                    "chunk_method": result_metadata.get("chunk_method"),
+                    "tokenizer": result_metadata.get("tokenizer")
                 }
             }
-            f.write(json.dumps(metadata, ensure_ascii=False) + '\n')
+            f.write(_dump_jsonl_line(metadata))
             
             # Write each chunk as a separate JSON line
             for chunk in processing_result.get("chunks", []):
@@ -117,9 +137,9 @@ class ExportService:
                 }
                 # Remove None values for cleaner output
                 chunk_data = {k: v for k, v in chunk_data.items() if v is not None}
-                f.write(json.dumps(chunk_data, ensure_ascii=False) + '\n')
+                f.write(_dump_jsonl_line(chunk_data))
     
-    async def _generate_json(self, file_path: Path, processing_result: Dict[str, Any]):
+    def _generate_json(self, file_path: Path, processing_result: Dict[str, Any]):
         """Generate JSON export with complete chunks"""
         export_data = {
             "metadata": {
@@ -145,14 +165,21 @@ class ExportService:
             })
         
         # Write formatted JSON
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(export_data, f, ensure_ascii=False, indent=2)
     
-    async def _generate_csv(self, file_path: Path, processing_result: Dict[str, Any]):
+    def _generate_csv(self, file_path: Path, processing_result: Dict[str, Any]):
         """Generate CSV export with complete chunks"""
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        filename = processing_result.get("filename", "")
+        # 1 MiB buffer so rows flush in large writes; writerows drives
+        # the loop from the C formatter instead of one call per row
+        with open(file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
-            
+
             # Write header
             writer.writerow([
                 "chunk_id",
@@ -164,10 +191,10 @@ class ExportService:
                 "tokenizer",
                 "filename"
             ])
-            
+
             # Write each chunk
-            for chunk in processing_result.get("chunks", []):
-                writer.writerow([
+            writer.writerows(
+                (
                     chunk.get("chunk_id"),
                     chunk.get("text"),  # FULL TEXT - NO TRUNCATION
                     chunk.get("tokens"),
@@ -175,8 +202,10 @@ class ExportService:
                     chunk.get("end_pos", ""),    # Empty string if None
                     chunk.get("metadata", {}).get("chunk_method", ""),
                     chunk.get("metadata", {}).get("tokenizer", ""),
-                    processing_result.get("filename", "")
-                ])
+                    filename
+                )
+                for chunk in processing_result.get("chunks", [])
+            )
     
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format"""
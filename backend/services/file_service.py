@@ -5,9 +5,9 @@ Week 1 implementation with local storage
 """
 
 import os
-import uuid
 import aiofiles
 from pathlib import Path
+from secrets import token_hex
 from datetime import datetime
 from typing import Optional
 import logging
@@ -39,10 +39,10 @@ class FileService:
                 detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE_MB}MB"
             )
         
-        # Check file extension
+        # Check file extension (frozenset membership, not a list scan)
         if file.filename:
             extension = Path(file.filename).suffix.lower().lstrip('.')
-            if extension not in settings.ALLOWED_FILE_EXTENSIONS:
+            if extension not in settings.allowed_extensions:
                 raise HTTPException(
                     status_code=400,
                     detail=f"File type '{extension}' not supported"
@@ -68,8 +68,9 @@ class FileService:
     async def save_upload(self, file: UploadFile, user_id: str) -> FileInfo:
         """Save uploaded file and return file info"""
         
-        # Generate unique file ID
-        file_id = str(uuid.uuid4())
+        # Generate unique file ID straight from urandom; skips the UUID
+        # class construction and dash formatting
+        file_id = token_hex(16)
         
         # Determine file extension and format
         file_extension = Path(file.filename).suffix.lower()
@@ -79,13 +80,13 @@ class FileService:
         file_path = Path(settings.UPLOAD_DIR) / safe_filename
         
         try:
-            # Save file to disk
+            # Stream the upload to disk in 1 MiB chunks so memory stays
+            # O(chunk) instead of O(file), counting bytes as they pass
+            file_size = 0
             async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
-            
-            # Get file size
-            file_size = len(content)
+                while chunk := await file.read(1024 * 1024):
+                    await f.write(chunk)
+                    file_size += len(chunk)
             
             # Detect format from extension
             format_name = self._detect_format(file.filename)
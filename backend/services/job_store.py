@@ -0,0 +1,94 @@
+# backend/services/job_store.py
+"""
+Wolfstitch Cloud - Job Store
+Redis-backed processing job state with in-memory fallback
+
+Job records live in Redis under job:{job_id} with a TTL, so status can be
+read from any API worker and state survives restarts. When Redis is not
+available (local development), records fall back to an in-process dict,
+matching the previous behaviour.
+"""
+
+import json
+import os
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Redis is optional in development
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+# Jobs expire after the same window as stored export files
+JOB_TTL_SECONDS = 24 * 3600
+
+
+class JobStore:
+    """Stores processing job records in Redis, falling back to memory"""
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = JOB_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._redis = None
+        self._redis_failed = False
+
+        if redis is not None:
+            url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            try:
+                self._redis = redis.from_url(url, encoding="utf-8", decode_responses=True)
+            except Exception as e:
+                logger.warning(f"Redis unavailable for job store: {e}")
+        else:
+            logger.warning("redis package not installed - job store using in-memory storage")
+
+    def _key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+
+    async def _redis_set(self, job_id: str, job: Dict[str, Any]):
+        """Write a job record to Redis, disabling Redis on repeated failure"""
+        if self._redis is None or self._redis_failed:
+            return
+        try:
+            await self._redis.set(self._key(job_id), json.dumps(job), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Job store falling back to memory, Redis write failed: {e}")
+            self._redis_failed = True
+
+    async def create(self, job_id: str, job: Dict[str, Any]):
+        """Create a job record"""
+        self._memory[job_id] = job
+        await self._redis_set(job_id, job)
+
+    async def update(self, job_id: str, **fields: Any):
+        """Update fields on an existing job record.
+
+        The worker that created a job also writes all its updates, so
+        its in-memory mirror is authoritative locally - merging there
+        turns each update into a single Redis SET instead of a GET+SET
+        round-trip pair. The Redis read only happens for jobs this
+        process has never seen.
+        """
+        job = self._memory.get(job_id)
+        if job is None:
+            job = await self.get(job_id)
+        if job is None:
+            logger.warning(f"Job not found for update: {job_id}")
+            return
+        job.update(fields)
+        self._memory[job_id] = job
+        await self._redis_set(job_id, job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a job record, preferring Redis"""
+        if self._redis is not None and not self._redis_failed:
+            try:
+                raw = await self._redis.get(self._key(job_id))
+                if raw is not None:
+                    return json.loads(raw)
+            except Exception as e:
+                logger.warning(f"Job store falling back to memory, Redis read failed: {e}")
+                self._redis_failed = True
+        return self._memory.get(job_id)
@@ -4,11 +4,11 @@ Handles file processing, job management, and status tracking
 Week 1 implementation with basic functionality
 """
 
-import uuid
 import asyncio
 import tempfile
 import os
 from datetime import datetime, timedelta
+from secrets import token_hex
 from typing import Dict, List, Optional, Any
 import logging
 
@@ -19,6 +19,19 @@ from backend.models.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Shared processor - built on first use so the wolfcore import stays
+# optional, then reused across jobs instead of reconstructing the
+# parser per file
+_processor = None
+
+
+def _get_processor():
+    global _processor
+    if _processor is None:
+        from wolfcore import Wolfstitch
+        _processor = Wolfstitch()
+    return _processor
+
 
 class ProcessingService:
     """Service for handling file processing operations"""
@@ -45,9 +58,6 @@ class ProcessingService:
             # Update job status to processing
             await self.update_job_status(job_id, "processing", 10.0, "Starting processing...")
             
-            # For Week 1, simulate processing with wolfcore
-            from wolfcore import Wolfstitch
-            
             # Get file path from file_id (mock implementation)
             file_path = f"uploads/{file_id}"  # Simplified for Week 1
             
@@ -57,7 +67,7 @@ class ProcessingService:
             # Process with wolfcore
             await self.update_job_status(job_id, "processing", 30.0, "Parsing file...")
             
-            wf = Wolfstitch()
+            wf = _get_processor()
             result = await wf.process_file_async(
                 file_path=file_path,
                 tokenizer=config.tokenizer,
@@ -285,7 +295,7 @@ class ProcessingService:
         custom_fields: Optional[List[str]] = None
     ) -> ExportResponse:
         """Export processing result"""
-        export_id = str(uuid.uuid4())
+        export_id = token_hex(16)
         
         # For Week 1, return mock export response
         return ExportResponse(
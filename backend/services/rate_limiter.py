@@ -5,19 +5,19 @@ Week 1 implementation with basic rate limiting
 
 import time
 import logging
+from collections import deque
 from typing import Dict, Optional
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
     """Basic rate limiter for Week 1"""
-    
+
     def __init__(self):
         # In-memory storage for rate limiting (Week 1)
         # In production, this would use Redis
-        self.requests: Dict[str, list] = {}
+        self.requests: Dict[str, deque] = {}
     
     async def check_processing_limit(self, user) -> bool:
         """Check processing rate limit for authenticated user"""
@@ -43,25 +43,29 @@ class RateLimiter:
         return "anonymous"
     
     def _is_rate_limited(self, client_id: str, limit: int, window_minutes: int = 60) -> bool:
-        """Check if client is rate limited"""
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=window_minutes)
-        
-        # Clean old requests
-        if client_id in self.requests:
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if req_time > window_start
-            ]
-        else:
-            self.requests[client_id] = []
-        
+        """Check if client is rate limited.
+
+        Sliding window over a deque of monotonic timestamps: stale
+        entries are popped from the left instead of rebuilding a list
+        of datetime objects on every check.
+        """
+        now = time.monotonic()
+        window_start = now - window_minutes * 60
+
+        window = self.requests.get(client_id)
+        if window is None:
+            window = self.requests[client_id] = deque()
+
+        # Drop requests that fell out of the window
+        while window and window[0] <= window_start:
+            window.popleft()
+
         # Check if over limit
-        if len(self.requests[client_id]) >= limit:
+        if len(window) >= limit:
             return True
-        
+
         # Add current request
-        self.requests[client_id].append(now)
+        window.append(now)
         return False
 
 
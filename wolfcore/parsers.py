@@ -22,6 +22,7 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union, BinaryIO
 from dataclasses import dataclass, field
+from functools import partial
 from datetime import datetime
 import chardet
 import tempfile
@@ -123,17 +124,42 @@ class FileParser:
         '.zsh': 'shell',
         '.fish': 'shell',
     }
-    
+
+    # Format families sharing a generic parser
+    TEXT_FORMATS = frozenset([
+        'txt', 'python', 'javascript', 'typescript', 'java', 'cpp', 'c',
+        'go', 'rust', 'ruby', 'php', 'swift', 'kotlin', 'csharp', 'r',
+        'scala', 'shell', 'markdown'
+    ])
+    MARKUP_FORMATS = frozenset(['html', 'xml'])
+    STRUCTURED_FORMATS = frozenset(['json', 'yaml', 'toml', 'ini', 'csv'])
+
     def __init__(self, max_file_size_mb: int = 100):
         """
         Initialize file parser
-        
+
         Args:
             max_file_size_mb: Maximum file size to process (MB)
         """
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
         self.temp_files = []  # Track temp files for cleanup
-        
+
+        # Precomputed format -> handler dispatch, built once instead of
+        # walking an if/elif chain on every parse call
+        self._format_handlers = {
+            'pdf': self._parse_pdf,
+            'docx': self._parse_docx,
+            'epub': self._parse_epub,
+            'xlsx': self._parse_xlsx,
+            'pptx': self._parse_pptx,
+        }
+        for fmt in self.TEXT_FORMATS:
+            self._format_handlers[fmt] = partial(self._parse_text_file, file_format=fmt)
+        for fmt in self.MARKUP_FORMATS:
+            self._format_handlers[fmt] = partial(self._parse_markup, file_format=fmt)
+        for fmt in self.STRUCTURED_FORMATS:
+            self._format_handlers[fmt] = partial(self._parse_structured_data, file_format=fmt)
+
     def parse(self, file_path: Union[str, Path, BinaryIO], 
               filename: Optional[str] = None) -> ParsedFile:
         """
@@ -188,29 +214,12 @@ class FileParser:
         
         # Extract content based on format
         start_time = datetime.now()
-        
-        if file_format == 'pdf':
-            result = self._parse_pdf(file_path)
-        elif file_format == 'docx':
-            result = self._parse_docx(file_path)
-        elif file_format == 'epub':
-            result = self._parse_epub(file_path)
-        elif file_format == 'xlsx':
-            result = self._parse_xlsx(file_path)
-        elif file_format == 'pptx':
-            result = self._parse_pptx(file_path)
-        elif file_format in ['txt', 'python', 'javascript', 'typescript', 
-                            'java', 'cpp', 'c', 'go', 'rust', 'ruby', 
-                            'php', 'swift', 'kotlin', 'csharp', 'r', 
-                            'scala', 'shell', 'markdown']:
-            result = self._parse_text_file(file_path, file_format)
-        elif file_format in ['html', 'xml']:
-            result = self._parse_markup(file_path, file_format)
-        elif file_format in ['json', 'yaml', 'toml', 'ini', 'csv']:
-            result = self._parse_structured_data(file_path, file_format)
-        else:
+
+        handler = self._format_handlers.get(file_format)
+        if handler is None:
             raise UnsupportedFormatError(f"Unsupported format: {file_format}")
-        
+        result = handler(file_path)
+
         # Set metadata
         result.filename = file_path.name
         result.format = file_format
@@ -222,9 +231,10 @@ class FileParser:
     def _parse_file_object(self, file_obj: BinaryIO, filename: str) -> ParsedFile:
         """Parse file from file-like object"""
         
-        # Save to temporary file for processing
-        with tempfile.NamedTemporaryFile(delete=False, 
-                                       suffix=f".{filename.split('.')[-1]}") as tmp:
+        # Save to temporary file for processing; splitext grabs the
+        # suffix at C level without splitting the whole name
+        with tempfile.NamedTemporaryFile(delete=False,
+                                       suffix=os.path.splitext(filename)[1]) as tmp:
             content = file_obj.read()
             tmp.write(content)
             tmp_path = Path(tmp.name)